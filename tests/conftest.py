@@ -5,6 +5,7 @@ import time
 import platform
 import tempfile
 import datetime
+import copy
 import requests
 import os
 import sys
@@ -249,6 +250,31 @@ def test_settings(test_dir, mocker, live_mock_server):
         wandb.run.finish()
 
 
+@pytest.fixture(scope="session")
+def _pristine_settings():
+    """Default Settings object built once per session, never mutated directly"""
+    return wandb.Settings()
+
+
+@pytest.fixture
+def fresh_settings(_pristine_settings):
+    """Copy of a default Settings object"""
+    return copy.copy(_pristine_settings)
+
+
+@pytest.fixture
+def make_settings(_pristine_settings):
+    """Factory for Settings objects, kwargs are applied like constructor arguments"""
+
+    def make(**kwargs):
+        s = copy.copy(_pristine_settings)
+        if kwargs:
+            s.update(kwargs, _source=s.Source.SETTINGS)
+        return s
+
+    return make
+
+
 @pytest.fixture
 def mocked_run(runner, test_settings):
     """A managed run object for tests with a mock backend"""
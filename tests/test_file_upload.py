@@ -9,25 +9,23 @@ import os
 import pytest
 
 
-def test_file_upload_good(mocked_run, publish_util, mock_server):
+def _begin_fn_factory(mocked_run):
     def begin_fn(interface):
         with open(os.path.join(mocked_run.dir, "test.txt"), "w") as f:
             f.write("TEST TEST")
 
-    files = [dict(files_dict=dict(files=[("test.txt", "now")]))]
-    ctx_util = publish_util(files=files, begin_cb=begin_fn)
-    assert "test.txt" in ctx_util.file_names
-
+    return begin_fn
 
-def test_file_upload_inject(mocked_run, publish_util, mock_server, inject_requests):
-    def begin_fn(interface):
-        with open(os.path.join(mocked_run.dir, "test.txt"), "w") as f:
-            f.write("TEST TEST")
 
-    query_str = "file=test.txt&run={}".format(mocked_run.id)
-    match = inject_requests.Match(path_suffix="/storage", query_str=query_str, count=2)
-    inject_requests.add(match=match, http_status=500)
+@pytest.mark.parametrize("inject", [False, True])
+def test_file_upload(mocked_run, publish_util, mock_server, inject_requests, inject):
+    if inject:
+        query_str = "file=test.txt&run={}".format(mocked_run.id)
+        match = inject_requests.Match(
+            path_suffix="/storage", query_str=query_str, count=2
+        )
+        inject_requests.add(match=match, http_status=500)
 
     files = [dict(files_dict=dict(files=[("test.txt", "now")]))]
-    ctx_util = publish_util(files=files, begin_cb=begin_fn)
+    ctx_util = publish_util(files=files, begin_cb=_begin_fn_factory(mocked_run))
     assert "test.txt" in ctx_util.file_names
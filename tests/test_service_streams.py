@@ -0,0 +1,135 @@
+"""
+streams tests.
+"""
+
+import threading
+
+import pytest
+from wandb.sdk.service import streams
+
+
+class FakeStream:
+    def __init__(self):
+        self.dropped = False
+        self.joined = False
+
+    def drop(self):
+        self.dropped = True
+
+    def join(self):
+        self.joined = True
+
+
+def _wait_handled(action, timeout=5):
+    t = threading.Thread(target=action.wait_handled, daemon=True)
+    t.start()
+    t.join(timeout)
+    return not t.is_alive()
+
+
+@pytest.fixture
+def mux(monkeypatch):
+    mux = streams.StreamMux()
+    added = []
+
+    def process_add(action):
+        added.append(FakeStream())
+        mux._streams[action.stream_id] = added[-1]
+
+    monkeypatch.setitem(mux._dispatch, "add", process_add)
+    mux.added = added
+    return mux
+
+
+def _run_batch(mux, actions):
+    # queue everything before the loop starts so it is drained as one batch
+    for action in actions:
+        mux._action_q.put(action)
+    loop = threading.Thread(target=mux._loop, daemon=True)
+    loop.start()
+    return loop
+
+
+def test_batch_add_before_del(mux):
+    actions = [
+        streams.StreamAction("add", "a"),
+        streams.StreamAction("del", "a"),
+        streams.StreamAction("add", "a"),
+        streams.StreamAction("drop", "a"),
+        streams.StreamAction("teardown", "na", data=0),
+    ]
+    loop = _run_batch(mux, actions)
+    assert all(_wait_handled(action) for action in actions)
+    loop.join(5)
+    assert not loop.is_alive()
+    assert len(mux.added) == 2
+    assert all(stream.joined for stream in mux.added)
+    assert [stream.dropped for stream in mux.added] == [False, True]
+    assert mux._streams == {}
+
+
+def test_batch_removals(mux):
+    fakes = {sid: FakeStream() for sid in "abcd"}
+    mux._streams.update(fakes)
+    actions = [
+        streams.StreamAction("del", "a"),
+        streams.StreamAction("drop", "b"),
+        streams.StreamAction("del", "c"),
+    ]
+    loop = _run_batch(mux, actions)
+    assert all(_wait_handled(action) for action in actions)
+    assert all(fakes[sid].joined for sid in "abc")
+    assert [fakes[sid].dropped for sid in "abc"] == [False, True, False]
+    assert list(mux._streams) == ["d"]
+    mux._stopped.set()
+    loop.join(5)
+
+
+def test_batch_unknown_stream(mux):
+    fakes = {sid: FakeStream() for sid in "ab"}
+    mux._streams.update(fakes)
+    actions = [
+        streams.StreamAction("del", "a"),
+        streams.StreamAction("del", "missing"),
+        streams.StreamAction("drop", "b"),
+    ]
+    loop = _run_batch(mux, actions)
+    assert all(_wait_handled(action) for action in actions)
+    assert fakes["a"].joined and fakes["b"].joined
+    assert mux._streams == {}
+    mux._stopped.set()
+    loop.join(5)
+
+
+def test_batch_stops_at_teardown(mux):
+    teardown = streams.StreamAction("teardown", "na", data=0)
+    late = streams.StreamAction("add", "late")
+    loop = _run_batch(mux, [teardown, late])
+    assert _wait_handled(teardown)
+    assert mux._stopped.is_set()
+    assert mux.added == []
+    # the loop waits on the queue, release it by consuming the late action
+    assert mux._action_q.get_nowait() is late
+    mux._action_q.task_done()
+    loop.join(5)
+    assert not loop.is_alive()
+
+
+def test_batch_error_releases_waiters(mux):
+    def bad_add(action):
+        raise ValueError("broken")
+
+    mux._dispatch["add"] = bad_add
+    mux._streams["a"] = FakeStream()
+    actions = [
+        streams.StreamAction("add", "x"),
+        streams.StreamAction("del", "a"),
+        streams.StreamAction("add", "y"),
+    ]
+    for action in actions:
+        mux._action_q.put(action)
+    batch = [mux._action_q.get_nowait() for _ in actions]
+    with pytest.raises(ValueError):
+        mux._process_actions(batch)
+    assert all(_wait_handled(action) for action in actions)
+    mux._action_q.join()
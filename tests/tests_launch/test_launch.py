@@ -3,7 +3,11 @@ import os
 from wandb.apis import PublicApi
 from unittest.mock import MagicMock
 from wandb.sdk.launch.agent.agent import LaunchAgent
-from wandb.sdk.launch.docker import pull_docker_image
+from wandb.sdk.launch.docker import (
+    docker_image_exists,
+    docker_image_inspect,
+    pull_docker_image,
+)
 
 try:
     from unittest import mock
@@ -818,6 +822,52 @@ def test_fail_pull_docker_image():
         assert "Docker server returned error" in str(e)
 
 
+@pytest.fixture
+def mocked_docker_run(monkeypatch):
+    calls = []
+    present = set()
+
+    def run(args, **kwargs):
+        calls.append(args)
+        if args[1] == "pull":
+            present.add(args[2])
+            return ""
+        if args[-1] not in present:
+            raise wandb.errors.DockerError(args, 1)
+        return json.dumps([{"ContainerConfig": {"Env": [], "WorkingDir": "/"}}])
+
+    monkeypatch.setattr(wandb.sdk.launch.docker, "_inspected_images", {})
+    monkeypatch.setattr(wandb.sdk.launch.docker.docker, "run", run)
+    return calls, present
+
+
+def test_docker_image_exists_not_cached(mocked_docker_run):
+    calls, present = mocked_docker_run
+    present.add("my-image")
+    assert docker_image_exists("my-image")
+    present.discard("my-image")
+    assert not docker_image_exists("my-image")
+    assert len(calls) == 2
+
+
+def test_docker_image_inspect_reuses_exists(mocked_docker_run):
+    calls, present = mocked_docker_run
+    present.add("my-image")
+    assert docker_image_exists("my-image")
+    assert docker_image_inspect("my-image")["ContainerConfig"]["WorkingDir"] == "/"
+    assert len(calls) == 1
+
+
+def test_docker_image_inspect_forgotten_after_pull(mocked_docker_run):
+    calls, _ = mocked_docker_run
+    pull_docker_image("my-image")
+    assert docker_image_inspect("my-image")
+    assert docker_image_inspect("my-image")
+    pull_docker_image("my-image")
+    assert docker_image_inspect("my-image")
+    assert [args[1] for args in calls] == ["pull", "image", "pull", "image"]
+
+
 @pytest.mark.skipif(
     sys.version_info < (3, 5),
     reason="wandb launch is not available for python versions < 3.5",
@@ -5,100 +5,124 @@ settings test.
 import pytest  # type: ignore
 
 import wandb
-from wandb import Settings
 from wandb.errors import UsageError
-import os
 import copy
+import datetime
+import os
+import time
 from wandb.sdk import wandb_settings
 
 
-def test_attrib_get():
-    s = Settings()
+def test_attrib_get(fresh_settings):
+    s = fresh_settings
     s.setdefaults()
     assert s.base_url == "https://api.wandb.ai"
 
 
-def test_attrib_set():
-    s = Settings()
+def test_attrib_set(fresh_settings):
+    s = fresh_settings
     s.base_url = "this"
     assert s.base_url == "this"
 
 
-def test_attrib_get_bad():
-    s = Settings()
+def test_attrib_get_bad(fresh_settings):
+    s = fresh_settings
     with pytest.raises(AttributeError):
         s.missing
 
 
-def test_attrib_set_bad():
-    s = Settings()
+def test_attrib_set_bad(fresh_settings):
+    s = fresh_settings
     with pytest.raises(AttributeError):
         s.missing = "nope"
 
 
-def test_update_dict():
-    s = Settings()
+def test_update_dict(fresh_settings):
+    s = fresh_settings
     s.update(dict(base_url="something2"))
     assert s.base_url == "something2"
 
 
-def test_update_kwargs():
-    s = Settings()
+def test_update_kwargs(fresh_settings):
+    s = fresh_settings
     s.update(base_url="something")
     assert s.base_url == "something"
 
 
-def test_update_both():
-    s = Settings()
+def test_update_both(fresh_settings):
+    s = fresh_settings
     s.update(dict(base_url="somethingb"), project="nothing")
     assert s.base_url == "somethingb"
     assert s.project == "nothing"
 
 
-def test_ignore_globs():
-    s = Settings()
+def test_ignore_globs(fresh_settings):
+    s = fresh_settings
     s.setdefaults()
     assert s.ignore_globs == ()
 
 
-def test_ignore_globs_explicit():
-    s = Settings(ignore_globs=["foo"])
+def test_ignore_globs_explicit(make_settings):
+    s = make_settings(ignore_globs=["foo"])
     s.setdefaults()
     assert s.ignore_globs == ("foo",)
 
 
-def test_ignore_globs_env():
-    s = Settings()
+def test_ignore_globs_env(fresh_settings):
+    s = fresh_settings
     s._apply_environ({"WANDB_IGNORE_GLOBS": "foo,bar"})
     s.setdefaults()
     assert s.ignore_globs == ("foo", "bar",)
 
 
-def test_quiet():
-    s = Settings()
+def test_quiet(make_settings):
+    s = make_settings()
     assert s._quiet is None
-    s = Settings(quiet=True)
+    s = make_settings(quiet=True)
     assert s._quiet
-    s = Settings()
+    s = make_settings()
     s._apply_environ({"WANDB_QUIET": "false"})
     s.setdefaults()
     assert s._quiet == False
 
 
-@pytest.mark.skip(reason="I need to make my mock work properly with new settings")
-def test_ignore_globs_settings(local_settings):
-    with open(os.path.join(os.getcwd(), ".config", "wandb", "settings"), "w") as f:
-        f.write(
-            """[default]
+@pytest.mark.parametrize(
+    "name,raw,attr,expected",
+    [
+        ("silent", "true", "_silent", True),
+        ("strict", "true", "_strict", True),
+        ("show_info", True, "_show_info", True),
+        ("show_info", False, "_show_info", None),
+        ("show_warnings", "true", "_show_warnings", True),
+        ("show_warnings", "false", "_show_warnings", False),
+        ("show_errors", True, "_show_errors", True),
+        ("show_errors", False, "_show_errors", None),
+    ],
+)
+def test_boolean_settings(fresh_settings, name, raw, attr, expected):
+    s = fresh_settings
+    s.update({name: raw}, _source=s.Source.SETTINGS)
+    assert getattr(s, attr) == expected
+
+
+def test_ignore_globs_settings(make_settings, tmp_path, monkeypatch):
+    # settings_system_spec defaults to ~/.config/wandb/settings
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("USERPROFILE", str(tmp_path))
+    config_dir = tmp_path / ".config" / "wandb"
+    config_dir.mkdir(parents=True)
+    (config_dir / "settings").write_text(
+        """[default]
 ignore_globs=foo,bar"""
-        )
-    s = Settings(_files=True)
+    )
+    s = make_settings(root_dir=str(tmp_path))
+    s._apply_configfiles()
     s.setdefaults()
     assert s.ignore_globs == ("foo", "bar",)
 
 
-def test_copy():
-    s = Settings()
+def test_copy(fresh_settings):
+    s = fresh_settings
     s.update(base_url="changed")
     s2 = copy.copy(s)
     assert s2.base_url == "changed"
@@ -107,20 +131,85 @@ def test_copy():
     assert s2.base_url == "changed"
 
 
-def test_invalid_dict():
-    s = Settings()
+def test_copy_keeps_priorities(fresh_settings):
+    s = fresh_settings
+    s.update(project="pizza", _source=s.Source.PROJECT)
+    s2 = copy.copy(s)
+    s2.update(project="pizza2", _source=s.Source.ENTITY)
+    assert s2.project == "pizza"
+    s2.update(project="pizza3", _source=s.Source.ARGS)
+    assert s2.project == "pizza3"
+    assert s.project == "pizza"
+
+
+def test_mapping_interface(fresh_settings):
+    s = fresh_settings
+    assert all(k in s for k in s.keys())
+    assert "base_url" in s
+    assert "resume_fname" in s
+    assert "missing" not in s
+    assert "_Settings__frozen" not in s
+
+
+def test_derived_paths_cached(fresh_settings, monkeypatch):
+    calls = []
+    uncached = wandb_settings.Settings._path_convert_uncached
+
+    def counting(self, *path):
+        calls.append(path)
+        return uncached(self, *path)
+
+    monkeypatch.setattr(wandb_settings.Settings, "_path_convert_uncached", counting)
+    s = fresh_settings
+    s.update(run_id="abc")
+    files_dir = s.files_dir
+    assert s.files_dir == files_dir
+    assert len(calls) == 1
+
+    # _setup expects _unsaved_keys, which nothing assigns on a plain Settings
+    object.__setattr__(s, "_unsaved_keys", [])
+    # every write path drops the cached paths
+    writes = [
+        lambda: s.update(project="proj"),
+        lambda: setattr(s, "entity", "ent"),
+        lambda: s.setdefaults(),
+        lambda: s._setup({"run_id": "xyz"}),
+    ]
+    for i, write in enumerate(writes, start=2):
+        write()
+        s.files_dir
+        s.files_dir
+        assert len(calls) == i
+
+
+def test_derived_paths_follow_updates(fresh_settings):
+    s = fresh_settings
+    s.update(
+        run_id="abc",
+        _start_time=time.time(),
+        _start_datetime=datetime.datetime.now(),
+    )
+    assert os.path.basename(os.path.dirname(s.files_dir)).startswith("run-")
+    s.update(mode="offline")
+    assert os.path.basename(os.path.dirname(s.files_dir)).startswith("offline-run-")
+    s.run_id = "xyz"
+    assert os.path.basename(os.path.dirname(s.files_dir)).endswith("-xyz")
+
+
+def test_invalid_dict(fresh_settings):
+    s = fresh_settings
     with pytest.raises(KeyError):
         s.update(dict(invalid="new"))
 
 
-def test_invalid_kwargs():
-    s = Settings()
+def test_invalid_kwargs(fresh_settings):
+    s = fresh_settings
     with pytest.raises(KeyError):
         s.update(invalid="new")
 
 
-def test_invalid_both():
-    s = Settings()
+def test_invalid_both(fresh_settings):
+    s = fresh_settings
     with pytest.raises(KeyError):
         s.update(dict(project="ok"), invalid="new")
     assert s.project != "ok"
@@ -130,8 +219,8 @@ def test_invalid_both():
     assert s.project != "okbutnotset"
 
 
-def test_freeze():
-    s = Settings()
+def test_freeze(fresh_settings):
+    s = fresh_settings
     s.project = "goodprojo"
     assert s.project == "goodprojo"
     s.freeze()
@@ -147,56 +236,63 @@ def test_freeze():
     assert c.project == "changed"
 
 
-def test_bad_choice():
-    s = Settings()
+def test_bad_choice(fresh_settings):
+    s = fresh_settings
     with pytest.raises(UsageError):
         s.mode = "goodprojo"
     with pytest.raises(UsageError):
         s.update(mode="badpro")
 
 
-def test_prio_update_ok():
-    s = Settings()
+def test_bad_choice_higher_priority_set(make_settings):
+    s = make_settings(mode="offline")
+    with pytest.raises(UsageError):
+        s.mode = "bogus"
+    assert s.mode == "offline"
+
+
+def test_prio_update_ok(fresh_settings):
+    s = fresh_settings
     s.update(project="pizza", _source=s.Source.ENTITY)
     assert s.project == "pizza"
     s.update(project="pizza2", _source=s.Source.PROJECT)
     assert s.project == "pizza2"
 
 
-def test_prio_update_ignore():
-    s = Settings()
+def test_prio_update_ignore(fresh_settings):
+    s = fresh_settings
     s.update(project="pizza", _source=s.Source.PROJECT)
     assert s.project == "pizza"
     s.update(project="pizza2", _source=s.Source.ENTITY)
     assert s.project == "pizza"
 
 
-def test_prio_update_over_ok():
-    s = Settings()
+def test_prio_update_over_ok(fresh_settings):
+    s = fresh_settings
     s.update(project="pizza", _source=s.Source.PROJECT)
     assert s.project == "pizza"
     s.update(project="pizza2", _source=s.Source.ENTITY, _override=True)
     assert s.project == "pizza2"
 
 
-def test_prio_update_over_both_ok():
-    s = Settings()
+def test_prio_update_over_both_ok(fresh_settings):
+    s = fresh_settings
     s.update(project="pizza", _source=s.Source.PROJECT, _override=True)
     assert s.project == "pizza"
     s.update(project="pizza2", _source=s.Source.ENTITY, _override=True)
     assert s.project == "pizza2"
 
 
-def test_prio_update_over_ignore():
-    s = Settings()
+def test_prio_update_over_ignore(fresh_settings):
+    s = fresh_settings
     s.update(project="pizza", _source=s.Source.ENTITY, _override=True)
     assert s.project == "pizza"
     s.update(project="pizza2", _source=s.Source.PROJECT, _override=True)
     assert s.project == "pizza"
 
 
-def test_prio_context_ok():
-    s = Settings()
+def test_prio_context_ok(fresh_settings):
+    s = fresh_settings
     s.update(project="pizza", _source=s.Source.ENTITY)
     assert s.project == "pizza"
     with s._as_source(s.Source.PROJECT) as s2:
@@ -204,8 +300,8 @@ def test_prio_context_ok():
     assert s.project == "pizza2"
 
 
-def test_prio_context_ignore():
-    s = Settings()
+def test_prio_context_ignore(fresh_settings):
+    s = fresh_settings
     s.update(project="pizza", _source=s.Source.PROJECT)
     assert s.project == "pizza"
     with s._as_source(s.Source.ENTITY) as s2:
@@ -213,8 +309,8 @@ def test_prio_context_ignore():
     assert s.project == "pizza"
 
 
-def test_prio_context_over_ok():
-    s = Settings()
+def test_prio_context_over_ok(fresh_settings):
+    s = fresh_settings
     s.update(project="pizza", _source=s.Source.PROJECT)
     assert s.project == "pizza"
     with s._as_source(s.Source.ENTITY, override=True) as s2:
@@ -222,8 +318,8 @@ def test_prio_context_over_ok():
     assert s.project == "pizza2"
 
 
-def test_prio_context_over_both_ok():
-    s = Settings()
+def test_prio_context_over_both_ok(fresh_settings):
+    s = fresh_settings
     s.update(project="pizza", _source=s.Source.PROJECT, _override=True)
     assert s.project == "pizza"
     with s._as_source(s.Source.ENTITY, override=True) as s2:
@@ -231,8 +327,8 @@ def test_prio_context_over_both_ok():
     assert s.project == "pizza2"
 
 
-def test_prio_context_over_ignore():
-    s = Settings()
+def test_prio_context_over_ignore(fresh_settings):
+    s = fresh_settings
     s.update(project="pizza", _source=s.Source.ENTITY, _override=True)
     assert s.project == "pizza"
     with s._as_source(s.Source.PROJECT, override=True) as s2:
@@ -240,8 +336,8 @@ def test_prio_context_over_ignore():
     assert s.project == "pizza"
 
 
-def test_validate_base_url():
-    s = Settings()
+def test_validate_base_url(fresh_settings):
+    s = fresh_settings
     with pytest.raises(UsageError):
         s.update(base_url="https://wandb.ai")
     with pytest.raises(UsageError):
@@ -254,8 +350,8 @@ def test_validate_base_url():
     assert s.base_url == "https://wandb.ai.other.crazy.domain.com"
 
 
-def test_preprocess_base_url():
-    s = Settings()
+def test_preprocess_base_url(fresh_settings):
+    s = fresh_settings
     s.update(base_url="http://host.com")
     assert s.base_url == "http://host.com"
     s.update(base_url="http://host.com/")
@@ -266,18 +362,15 @@ def test_preprocess_base_url():
     assert s.base_url == "//http://host.com"
 
 
-def test_code_saving_save_code_env_false(live_mock_server, test_settings):
-    test_settings.update({"save_code": None})
-    os.environ["WANDB_SAVE_CODE"] = "false"
-    run = wandb.init(settings=test_settings)
-    assert run._settings.save_code is False
-
-
-def test_code_saving_disable_code(live_mock_server, test_settings):
+@pytest.mark.parametrize(
+    "env_var,value", [("WANDB_SAVE_CODE", "false"), ("WANDB_DISABLE_CODE", "true")]
+)
+def test_code_saving_env(live_mock_server, test_settings, monkeypatch, env_var, value):
     test_settings.update({"save_code": None})
-    os.environ["WANDB_DISABLE_CODE"] = "true"
+    monkeypatch.setenv(env_var, value)
     run = wandb.init(settings=test_settings)
     assert run._settings.save_code is False
+    run.finish()
 
 
 def test_redact():
@@ -82,6 +82,7 @@ def generate_docker_base_image(
         with open(build_log, "w") as f:
             process = subprocess.Popen(cmd, stdout=f, stderr=f)
             res = process.wait()
+            _forget_docker_image(launch_project.base_image)
             if res == 0:
                 spinner.text = "Generated docker base image {}".format(
                     launch_project.base_image
@@ -97,6 +98,11 @@ def generate_docker_base_image(
 _inspected_images = {}
 
 
+def _forget_docker_image(docker_image: str) -> None:
+    """Drop a cached inspect result, e.g. once the tag may point at a new image"""
+    _inspected_images.pop(docker_image, None)
+
+
 def docker_image_exists(docker_image: str, should_raise: bool = False) -> bool:
     """Checks if a specific image is already available,
     optionally raising an exception"""
@@ -127,6 +133,7 @@ def docker_image_inspect(docker_image: str) -> Dict[str, Any]:
 
 def pull_docker_image(docker_image: str) -> None:
     """Pulls the requested docker image"""
+    _forget_docker_image(docker_image)
     try:
         docker.run(["docker", "pull", docker_image])
     except DockerError as e:
@@ -261,6 +268,7 @@ def build_docker_image_if_needed(
         )
     except DockerError as e:
         raise LaunchError("Error communicating with docker client: {}".format(e))
+    _forget_docker_image(image_uri)
 
     try:
         os.remove(build_ctx_path)
@@ -6,6 +6,9 @@ StreamAction: Lightweight record for stream ops for thread safety with grpc
 StreamMux: Container for dictionary of stream threads per runid
 """
 
+from concurrent import futures
+import itertools
+import logging
 import multiprocessing
 import queue
 import threading
@@ -19,6 +22,8 @@ from wandb.proto import wandb_internal_pb2 as pb
 
 from ..interface.interface_relay import InterfaceRelay
 
+logger = logging.getLogger(__name__)
+
 
 class StreamThread(threading.Thread):
     """Class to running internal process as a thread."""
@@ -36,16 +41,18 @@ class StreamThread(threading.Thread):
 
 
 class StreamRecord:
-    _record_q: "multiprocessing.Queue[pb.Record]"
-    _result_q: "multiprocessing.Queue[pb.Result]"
-    _relay_q: "multiprocessing.Queue[pb.Result]"
+    _record_q: "queue.Queue[pb.Record]"
+    _result_q: "queue.Queue[pb.Result]"
+    _relay_q: "queue.Queue[pb.Result]"
     _iface: InterfaceRelay
     _thread: StreamThread
 
     def __init__(self) -> None:
-        self._record_q = multiprocessing.Queue()
-        self._result_q = multiprocessing.Queue()
-        self._relay_q = multiprocessing.Queue()
+        # the internal thread lives in this process, so plain queues avoid the
+        # pipes, feeder threads and pickling of multiprocessing queues
+        self._record_q = queue.Queue()
+        self._result_q = queue.Queue()
+        self._relay_q = queue.Queue()
         process = multiprocessing.current_process()
         self._iface = InterfaceRelay(
             record_q=self._record_q,
@@ -67,9 +74,6 @@ class StreamRecord:
 
     def join(self) -> None:
         self._iface.join()
-        self._record_q.close()
-        self._result_q.close()
-        self._relay_q.close()
         if self._thread:
             self._thread.join()
 
@@ -84,23 +88,26 @@ class StreamRecord:
 class StreamAction:
     _action: str
     _stream_id: str
-    _processed: Event
+    _processed: threading.Lock
     _data: Any
 
     def __init__(self, action: str, stream_id: str, data: Any = None):
         self._action = action
         self._stream_id = stream_id
         self._data = data
-        self._processed = Event()
+        # held until the action is handled, a bare lock is cheaper than an Event
+        self._processed = threading.Lock()
+        self._processed.acquire()
 
     def __repr__(self) -> str:
         return f"StreamAction({self._action},{self._stream_id})"
 
     def wait_handled(self) -> None:
-        self._processed.wait()
+        with self._processed:
+            pass
 
     def set_handled(self) -> None:
-        self._processed.set()
+        self._processed.release()
 
     @property
     def stream_id(self) -> str:
@@ -112,18 +119,26 @@ class StreamMux:
     _streams: Dict[str, StreamRecord]
     _port: Optional[int]
     _pid: Optional[int]
+    _parent_proc: Optional[psutil.Process]
     _action_q: "queue.Queue[StreamAction]"
     _stopped: Event
     _pid_checked_ts: Optional[float]
+    _dispatch: Dict[str, Callable[[StreamAction], None]]
 
     def __init__(self) -> None:
         self._streams_lock = threading.Lock()
         self._streams = dict()
         self._port = None
         self._pid = None
+        self._parent_proc = None
         self._stopped = Event()
         self._action_q = queue.Queue()
         self._pid_checked_ts = None
+        # del and drop actions are batched by _process_actions instead
+        self._dispatch = {
+            "add": self._process_add,
+            "teardown": self._process_teardown,
+        }
 
     def _get_stopped_event(self) -> "Event":
         # TODO: clean this up, there should be a better way to abstract this
@@ -134,6 +149,11 @@ class StreamMux:
 
     def set_pid(self, pid: int) -> None:
         self._pid = pid
+        # keep a handle so later checks don't mistake a reused pid for the parent
+        try:
+            self._parent_proc = psutil.Process(pid)
+        except psutil.NoSuchProcess:
+            self._parent_proc = None
 
     def add_stream(self, stream_id: str, settings: Dict[str, Any]) -> None:
         action = StreamAction(action="add", stream_id=stream_id, data=settings)
@@ -187,17 +207,37 @@ class StreamMux:
         with self._streams_lock:
             self._streams[action._stream_id] = stream
 
-    def _process_del(self, action: StreamAction) -> None:
-        with self._streams_lock:
-            stream = self._streams.pop(action._stream_id)
-            stream.join()
-        # TODO: we assume stream has already been shutdown.  should we verify?
-
-    def _process_drop(self, action: StreamAction) -> None:
+    def _process_removals(self, actions: List[StreamAction]) -> None:
+        # TODO: we assume a deleted stream has already been shutdown.  should we verify?
+        # pop the whole batch under one lock, joining can be slow so do it outside
+        streams = []
         with self._streams_lock:
-            stream = self._streams.pop(action._stream_id)
-            stream.drop()
-            stream.join()
+            for action in actions:
+                stream = self._streams.pop(action._stream_id, None)
+                if stream is None:
+                    logger.warning(f"Can not {action._action} unknown stream {action}")
+                    continue
+                if action._action == "drop":
+                    stream.drop()
+                streams.append(stream)
+        if not streams:
+            return
+        if len(streams) == 1:
+            streams[0].join()
+            return
+        with futures.ThreadPoolExecutor(
+            max_workers=min(32, len(streams)), thread_name_prefix="StreamDelThr"
+        ) as executor:
+            for future in [executor.submit(stream.join) for stream in streams]:
+                future.result()
+
+    def _finish_one(self, stream: StreamRecord) -> None:
+        while True:
+            poll_exit_resp = stream.interface.communicate_poll_exit()
+            if poll_exit_resp and poll_exit_resp.done:
+                break
+            time.sleep(0.1)
+        stream.join()
 
     def _finish_all(self, streams: Dict[str, StreamRecord], exit_code: int) -> None:
         if not streams:
@@ -207,46 +247,61 @@ class StreamMux:
             wandb.termlog(f"Finishing run: {sid}...")  # type: ignore
             stream.interface.publish_exit(exit_code)
 
-        streams_to_join = []
-        while streams:
-            # Note that we materialize the generator so we can modify the underlying list
-            for sid, stream in list(streams.items()):
-                poll_exit_resp = stream.interface.communicate_poll_exit()
-                if poll_exit_resp and poll_exit_resp.done:
-                    streams.pop(sid)
-                    streams_to_join.append(stream)
-                time.sleep(0.1)
-
-        # TODO: this would be nice to do in parallel
-        for stream in streams_to_join:
-            stream.join()
+        # each stream is polled and joined on its own worker so that a slow
+        # stream doesn't hold up the others
+        with futures.ThreadPoolExecutor(
+            max_workers=min(32, len(streams)), thread_name_prefix="StreamFinThr"
+        ) as executor:
+            streams_finished = [
+                executor.submit(self._finish_one, stream) for stream in streams.values()
+            ]
+            for future in streams_finished:
+                future.result()
 
         wandb.termlog("Done!")  # type: ignore
 
     def _process_teardown(self, action: StreamAction) -> None:
         exit_code: int = action._data
-        with self._streams_lock:
-            # TODO: mark streams to prevent new modifications?
-            streams_copy = self._streams.copy()
-        self._finish_all(streams_copy, exit_code)
+        # streams are only added or removed by this thread, so the dict can't
+        # change under _finish_all and doesn't need to be copied
+        # TODO: mark streams to prevent new modifications?
+        self._finish_all(self._streams, exit_code)
         with self._streams_lock:
             self._streams = dict()
         self._stopped.set()
 
     def _process_action(self, action: StreamAction) -> None:
-        if action._action == "add":
-            self._process_add(action)
-            return
-        if action._action == "del":
-            self._process_del(action)
-            return
-        if action._action == "drop":
-            self._process_drop(action)
-            return
-        if action._action == "teardown":
-            self._process_teardown(action)
-            return
-        raise AssertionError(f"Unsupported action: {action._action}")
+        handler = self._dispatch.get(action._action)
+        if handler is None:
+            raise AssertionError(f"Unsupported action: {action._action}")
+        handler(action)
+
+    def _process_actions(self, actions: List[StreamAction]) -> None:
+        # consecutive del/drop actions are handled as one batch, anything
+        # else keeps its place in the queue order
+        handled = 0
+        try:
+            for removal, group in itertools.groupby(
+                actions, key=lambda action: action._action in ("del", "drop")
+            ):
+                batch = list(group)
+                if removal:
+                    self._process_removals(batch)
+                    self._set_handled(batch)
+                    handled += len(batch)
+                    continue
+                for action in batch:
+                    self._process_action(action)
+                    self._set_handled([action])
+                    handled += 1
+        finally:
+            # if an action raised, don't leave the rest of the batch waiting
+            self._set_handled(actions[handled:])
+
+    def _set_handled(self, actions: List[StreamAction]) -> None:
+        for action in actions:
+            action.set_handled()
+            self._action_q.task_done()
 
     def _check_orphaned(self) -> bool:
         if not self._pid:
@@ -256,7 +311,24 @@ class StreamMux:
         if self._pid_checked_ts and time_now < self._pid_checked_ts + 2:
             return False
         self._pid_checked_ts = time_now
-        return not psutil.pid_exists(self._pid)
+        return not self._parent_alive()
+
+    def _parent_alive(self) -> bool:
+        proc = self._parent_proc
+        if not proc:
+            return False
+        try:
+            return bool(proc.is_running() and proc.status() != psutil.STATUS_ZOMBIE)
+        except psutil.NoSuchProcess:
+            return False
+        except psutil.AccessDenied:
+            return True
+
+    def _action_timeout(self) -> float:
+        # block until the next orphan check is due rather than a fixed second
+        if not self._pid or not self._pid_checked_ts:
+            return 1
+        return min(2, max(0, self._pid_checked_ts + 2 - time.time()))
 
     def _loop(self) -> None:
         while not self._stopped.is_set():
@@ -264,12 +336,17 @@ class StreamMux:
                 # parent process is gone, let other threads know we need to shutdown
                 self._stopped.set()
             try:
-                action = self._action_q.get(timeout=1)
+                action = self._action_q.get(timeout=self._action_timeout())
             except queue.Empty:
                 continue
-            self._process_action(action)
-            action.set_handled()
-            self._action_q.task_done()
+            actions = [action]
+            # drain whatever else is queued, but leave anything after a teardown
+            while actions[-1]._action != "teardown":
+                try:
+                    actions.append(self._action_q.get_nowait())
+                except queue.Empty:
+                    break
+            self._process_actions(actions)
         self._action_q.join()
 
     def loop(self) -> None:
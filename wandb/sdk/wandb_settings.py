@@ -26,6 +26,7 @@ import copy
 from datetime import datetime
 from distutils.util import strtobool
 import enum
+import functools
 import getpass
 import itertools
 import json
@@ -43,7 +44,6 @@ from typing import (
     cast,
     Dict,
     FrozenSet,
-    Generator,
     Iterable,
     Iterator,
     List,
@@ -135,6 +135,10 @@ def _build_inverse_map(prefix: str, d: Dict[str, Optional[str]]) -> Dict[str, st
     return inv_map
 
 
+# env_settings is static, so resolve the WANDB_* name of every setting once
+env_inverse_map: Dict[str, str] = _build_inverse_map(env_prefix, env_settings)
+
+
 def _error_choices(value: str, choices: Set[str]) -> str:
     return "{} not in [{}]".format(value, ", ".join(list(choices)))
 
@@ -306,6 +310,7 @@ class Settings(object):
     __override_dict: Dict[str, int]
     __defaults_dict_set: Dict[str, Set[int]]
     __override_dict_set: Dict[str, Set[int]]
+    __path_cache: Dict[Tuple, Optional[str]]
 
     @enum.unique
     class Source(enum.IntEnum):
@@ -448,6 +453,7 @@ class Settings(object):
         object.__setattr__(self, "_Settings__override_dict", dict())
         object.__setattr__(self, "_Settings__defaults_dict_set", dict())
         object.__setattr__(self, "_Settings__override_dict_set", dict())
+        object.__setattr__(self, "_Settings__path_cache", dict())
         object.__setattr__(self, "_Settings_start_datetime", None)
         object.__setattr__(self, "_Settings_start_time", None)
         class_defaults = self._get_class_defaults()
@@ -769,12 +775,11 @@ class Settings(object):
     def _apply_environ(
         self, environ: os._Environ, _logger: Optional[_EarlyLogger] = None
     ) -> None:
-        inv_map = _build_inverse_map(env_prefix, env_settings)
         env_dict = dict()
         for k, v in six.iteritems(environ):
             if not k.startswith(env_prefix):
                 continue
-            setting_key = inv_map.get(k)
+            setting_key = env_inverse_map.get(k)
             if setting_key:
                 conv = env_convert.get(setting_key, None)
                 if conv:
@@ -830,6 +835,14 @@ class Settings(object):
     def _path_convert(self, *path: Any) -> Optional[str]:
         """convert slashes, expand ~ and other macros."""
 
+        # derived paths (files_dir, sync_file, ...) are read far more often
+        # than settings change, so keep them until the next write
+        key = (os.getpid(),) + path
+        if key not in self.__path_cache:
+            self.__path_cache[key] = self._path_convert_uncached(*path)
+        return self.__path_cache[key]
+
+    def _path_convert_uncached(self, *path: Any) -> Optional[str]:
         format_dict: Dict[str, Union[str, int]] = dict()
         if self._start_time and self._start_datetime:
             format_dict["timespec"] = datetime.strftime(
@@ -861,32 +874,58 @@ class Settings(object):
         for k, v in six.iteritems(kwargs):
             if k not in self._unsaved_keys:
                 object.__setattr__(self, k, v)
+        self.__path_cache.clear()
 
     def __copy__(self) -> "Settings":
         """Copy (note that the copied object will not be frozen)."""
-        s = Settings()
-        s._apply_settings(self)
+        # values are shared (as with any shallow copy), the source bookkeeping
+        # is copied so updates to the copy don't leak into the original
+        s = object.__new__(type(self))
+        s.__dict__.update(self.__dict__)
+        object.__setattr__(s, "_Settings__frozen", False)
+        object.__setattr__(s, "_Settings__defaults_dict", self.__defaults_dict.copy())
+        object.__setattr__(s, "_Settings__override_dict", self.__override_dict.copy())
+        object.__setattr__(
+            s,
+            "_Settings__defaults_dict_set",
+            {k: v.copy() for k, v in self.__defaults_dict_set.items()},
+        )
+        object.__setattr__(
+            s,
+            "_Settings__override_dict_set",
+            {k: v.copy() for k, v in self.__override_dict_set.items()},
+        )
+        object.__setattr__(s, "_Settings__path_cache", dict())
         return s
 
     def duplicate(self) -> "Settings":
         return copy.copy(self)
 
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _field_methods(cls, prefix: str) -> Dict[str, Callable]:
+        """Map each setting to its `<prefix><setting>` method, e.g. `_validate_mode`."""
+        return {
+            name[len(prefix) :]: getattr(cls, name)
+            for name in dir(cls)
+            if name.startswith(prefix) and callable(getattr(cls, name))
+        }
+
     def _check_invalid(self, k: str, v: Any) -> None:
         if v is None:
             return
-        f = getattr(self, "_validate_" + k, None)
-        if not f or not callable(f):
+        f = self._field_methods("_validate_").get(k)
+        if f is None:
             return
-        invalid = f(v)
+        invalid = f(self, v)
         if invalid:
             raise UsageError("Settings field `{}`: {}".format(k, invalid))
 
     def _perform_preprocess(self, k: str, v: Any) -> Optional[Any]:
-        f = getattr(self, "_preprocess_" + k, None)
-        if not f or not callable(f):
+        f = self._field_methods("_preprocess_").get(k)
+        if f is None:
             return v
-        else:
-            return f(v)
+        return f(self, v)
 
     def _update(
         self,
@@ -897,20 +936,23 @@ class Settings(object):
     ) -> None:
         if self.__frozen and (__d or kwargs):
             raise TypeError("Settings object is frozen")
-        d = __d or dict()
+        incoming = {**(__d or {}), **kwargs}
+        # reject unknown keys up front so nothing is applied on error
+        unknown = incoming.keys() - self.__dict__.keys()
+        if unknown:
+            raise KeyError(next(k for k in incoming if k in unknown))
         data = {}
-        for check in d, kwargs:
-            for k in six.viewkeys(check):
-                if k not in self.__dict__:
-                    raise KeyError(k)
-                v = self._perform_preprocess(k, check[k])
-                self._check_invalid(k, v)
-                data[k] = v
+        for k, v in six.iteritems(incoming):
+            # decide whether the value would be applied before paying for
+            # preprocessing and validation
+            if v is None or self._update_is_noop(k, v, _source, _override):
+                continue
+            v = self._perform_preprocess(k, v)
+            self._check_invalid(k, v)
+            data[k] = v
         for k, v in six.iteritems(data):
             if v is None:
                 continue
-            if self._priority_failed(k, source=_source, override=_override):
-                continue
             if isinstance(v, list):
                 v = tuple(v)
             self.__dict__[k] = v
@@ -920,6 +962,8 @@ class Settings(object):
             if _override:
                 self.__override_dict[k] = _override
                 self.__override_dict_set.setdefault(k, set()).add(_override)
+        if data:
+            self.__path_cache.clear()
 
     def update(self, __d: Dict = None, **kwargs: Any) -> None:
         _source = kwargs.pop("_source", None)
@@ -932,6 +976,21 @@ class Settings(object):
 
         # self._update(__d, **kwargs)
 
+    def _update_is_noop(
+        self, k: str, v: Any, source: Optional[int], override: Optional[int]
+    ) -> bool:
+        if self._priority_failed(k, source=source, override=override):
+            return True
+        # re-applying the current value from the same source changes nothing,
+        # e.g. wandb.init() applying the setup settings to a copy of themselves
+        return (
+            source is not None
+            and not override
+            and self.__defaults_dict.get(k) == source
+            and k not in self.__override_dict
+            and self.__dict__[k] == v
+        )
+
     def _priority_failed(
         self, k: str, source: Optional[int], override: Optional[int]
     ) -> bool:
@@ -1044,6 +1103,7 @@ class Settings(object):
             if not k.startswith("_"):
                 if self.__dict__.get(k) is None:
                     object.__setattr__(self, k, v)
+        self.__path_cache.clear()
 
     def save(self, fname: str) -> None:
         pass
@@ -1055,25 +1115,41 @@ class Settings(object):
         # using source.SETUP is a temporary hack here that should be replaced by
         # having _apply_init() apply SOURCE.INIT to settings added via mutations
         # to settings object
+        if self.__frozen:
+            raise TypeError("Settings object is frozen")
+        # _update skips validating values it won't apply, but the value is
+        # written below regardless, so validate those here
+        if (
+            value is not None
+            and name in self.__dict__
+            and self._update_is_noop(name, value, self.Source.SETUP, None)
+        ):
+            self._check_invalid(name, self._perform_preprocess(name, value))
         try:
             self._update({name: value}, _source=self.Source.SETUP)
         except KeyError as e:
             raise AttributeError(str(e))
         object.__setattr__(self, name, value)
+        self.__path_cache.clear()
 
+    # the class attributes never change at runtime, so the schema derived from
+    # them is computed once per class rather than on every Settings() or lookup
     @classmethod
-    def _property_keys(cls) -> Generator[str, None, None]:
-        return (k for k, v in vars(cls).items() if isinstance(v, property))
+    @functools.lru_cache(maxsize=None)
+    def _property_keys(cls) -> Tuple[str, ...]:
+        return tuple(k for k, v in vars(cls).items() if isinstance(v, property))
 
     @classmethod
-    def _class_keys(cls) -> Generator[str, None, None]:
-        return (
+    @functools.lru_cache(maxsize=None)
+    def _class_keys(cls) -> Tuple[str, ...]:
+        return tuple(
             k
             for k, v in vars(cls).items()
             if not k.startswith("_") and not callable(v) and not isinstance(v, property)
         )
 
     @classmethod
+    @functools.lru_cache(maxsize=None)
     def _get_class_defaults(cls) -> dict:
         class_keys = set(cls._class_keys())
         return dict(
@@ -1092,6 +1168,11 @@ class Settings(object):
             return getattr(self, k)
         return self.__dict__[k]
 
+    def __contains__(self, k: str) -> bool:
+        if k in self.__dict__:
+            return not k.startswith("_Settings__")
+        return k in self._property_keys()
+
     def freeze(self) -> "Settings":
         self.__frozen = True
         return self
@@ -1195,6 +1276,8 @@ class Settings(object):
         return Settings._Setter(settings=self, source=source, override=override)
 
     class _Setter(object):
+        __slots__ = ("_settings", "_source", "_override")
+
         _settings: "Settings"
         _source: int
         _override: int